@@ -1,62 +1,168 @@
 # Author credit goes to former student Brendan Smith from the Spring 2022 class.
 #
-from collections import deque
-from typing import Any, Dict, Iterable
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, TextIO, Tuple
 from py_btrees.btree import BTree
 from py_btrees.btree_node import BTreeNode, get_node
 from py_btrees.disk import Address
 
-import graphviz
-from graphviz import nohtml
+# graphviz is only needed to render, so it is imported inside create() / summarize().
+# iterate(), index_nodes() and the streaming writers work without it.
+if TYPE_CHECKING:
+    import graphviz
 
 
-def create(tree: BTree) -> None:
+def create(tree: BTree, root_addr: Optional[Address] = None, max_depth: Optional[int] = None) -> "graphviz.Digraph":
+    """
+    Build a graphviz digraph of the tree, or of the subtree rooted at root_addr.
+    With max_depth, nodes deeper than max_depth levels below the start are left out
+    and each cut-off parent gets a single placeholder node instead.
+    """
+    import graphviz
+    from graphviz import nohtml
+
     g = graphviz.Digraph("btree", node_attr={"shape": "record", "height": ".1"})
 
-    d = index_nodes(tree)
+    d = index_nodes(tree, root_addr, max_depth)
 
     for node in d.values():
         name = str(node.my_addr)
-        label = None
 
-        keys = [stringify(k) for k in node.keys]
+        g.node(name, nohtml(label(node)))
 
-        if node.is_leaf:
-            keySection = "|".join(keys)
-            dataSection = "|".join([stringify(x) for x in node.data])
-            label = f"{{{keySection}}}|{{{dataSection}}}"
+        for i, childAddr in enumerate(node.children_addrs):
+            if childAddr not in d:
+                g.node(f"{name}_more", f"... {len(node.children_addrs)} subtrees", shape="plaintext")
+                g.edge(name, f"{name}_more", style="dashed")
+                break
+            child = d[childAddr]
+            g.edge(f"{name}:f{i}", str(child.my_addr), label=str(child.index_in_parent))
 
-        else:
-            links = [f"<f{i}>" for i in range(len(node.children_addrs))]
+    return g
 
-            boxes = [""] * (len(links) + len(keys))
-            boxes[::2] = links
-            boxes[1::2] = keys
 
-            label = "|".join(boxes)
+def summarize(tree: BTree, sample: Optional[float] = None, seed: Optional[int] = None) -> "graphviz.Digraph":
+    """
+    Build a graphviz digraph with one record per level of the tree, showing the level's
+    node count, key count, bytes on disk and fill histogram (see BTree.stats()).
+    Unlike create(), the size of the render does not grow with the tree.
+    """
+    import graphviz
+    from graphviz import nohtml
 
-        g.node(name, nohtml(label))
+    g = graphviz.Digraph("btree_levels", node_attr={"shape": "record", "height": ".1"})
 
-        for i, childAddr in enumerate(node.children_addrs):
-            child = d[childAddr]
-            g.edge(f"{name}:f{i}", str(child.my_addr), label=str(child.index_in_parent))
+    stats = tree.stats(sample, seed)
+    for level in stats.levels:
+        histogram = " ".join(str(n) for n in level.fill)
+        fields = [f"depth {level.depth}", f"{level.nodes} nodes", f"{level.keys} keys", f"{level.bytes} bytes", f"fill {histogram}"]
+        g.node(f"level{level.depth}", nohtml("{" + "|".join(fields) + "}"))
+        if level.depth:
+            g.edge(f"level{level.depth - 1}", f"level{level.depth}")
 
     return g
 
 
-def iterate(tree: BTree) -> Iterable[BTreeNode]:
-    q = deque([get_node(tree.root_addr)])
-
-    while len(q):
-        node = q.popleft()
+def write_dot(tree: BTree, out: TextIO, root_addr: Optional[Address] = None, max_depth: Optional[int] = None) -> None:
+    """
+    Write the same graph as create() as DOT source to `out`, one node at a time.
+    Nodes are never held together; only the addresses of two adjacent levels are
+    (see iterate_levels()), so this works for trees that are far too large for create().
+    """
+    out.write('digraph btree {\n\tnode [height=".1" shape=record]\n')
+    for depth, node in iterate_levels(tree, root_addr, max_depth):
+        name = str(node.my_addr)
+        out.write(f'\t{name} [label="{escape(label(node))}"]\n')
+        if max_depth is not None and depth == max_depth and node.children_addrs:
+            out.write(f'\t{name}_more [label="... {len(node.children_addrs)} subtrees" shape=plaintext]\n')
+            out.write(f'\t{name} -> {name}_more [style=dashed]\n')
+            continue
+        for i, childAddr in enumerate(node.children_addrs):
+            out.write(f'\t{name}:f{i} -> {childAddr} [label={i}]\n')
+    out.write("}\n")
+
+
+def write_json(tree: BTree, out: TextIO, root_addr: Optional[Address] = None, max_depth: Optional[int] = None) -> None:
+    """
+    Write the tree to `out` as a JSON array of node objects in level order, one node at a time.
+    NumPy-backed leaves (NumericBTree) are written as plain JSON numbers; other keys and
+    data that are not JSON types are written as their str().
+    """
+    out.write("[")
+    for n, (depth, node) in enumerate(iterate_levels(tree, root_addr, max_depth)):
+        record = {
+            "addr": node.my_addr,
+            "depth": depth,
+            "parent_addr": node.parent_addr,
+            "index_in_parent": node.index_in_parent,
+            "is_leaf": node.is_leaf,
+            "keys": as_list(node.keys),
+            "children_addrs": list(node.children_addrs),
+            "counts": list(node.counts),
+            "data": as_list(node.data),
+        }
+        out.write(",\n" if n else "\n")
+        out.write(json.dumps(record, default=str))
+    out.write("\n]\n")
+
+
+def iterate_levels(tree: BTree, root_addr: Optional[Address] = None, max_depth: Optional[int] = None) -> Iterable[Tuple[int, BTreeNode]]:
+    """
+    Yield (depth, node) in level order starting at root_addr (the tree's root by default),
+    stopping after max_depth levels below it. Nodes are read from disk one at a time and
+    dropped once yielded. What is kept is addresses: those of the level being walked plus
+    the next level as it is collected, so at most two adjacent levels (at the bottom,
+    the last non-leaf level and every leaf).
+    """
+    level: List[Address] = [tree.root_addr if root_addr is None else root_addr]
+    depth = 0
+
+    while len(level):
+        next_level: List[Address] = []
+        for addr in level:
+            node = get_node(addr)
+            yield depth, node
+            if max_depth is None or depth < max_depth:
+                next_level.extend(node.children_addrs)
+        level = next_level
+        depth += 1
+
+
+def iterate(tree: BTree, root_addr: Optional[Address] = None, max_depth: Optional[int] = None) -> Iterable[BTreeNode]:
+    for _, node in iterate_levels(tree, root_addr, max_depth):
         yield node
 
-        for childAddr in node.children_addrs:
-            q.append(get_node(childAddr))
+
+def index_nodes(tree: BTree, root_addr: Optional[Address] = None, max_depth: Optional[int] = None) -> Dict[Address, BTreeNode]:
+    return {node.my_addr: node for node in iterate(tree, root_addr, max_depth)}
+
+
+def label(node: BTreeNode) -> str:
+    keys = [stringify(k) for k in node.keys]
+
+    if node.is_leaf:
+        keySection = "|".join(keys)
+        dataSection = "|".join([stringify(x) for x in node.data])
+        return f"{{{keySection}}}|{{{dataSection}}}"
+
+    links = [f"<f{i}>" for i in range(len(node.children_addrs))]
+
+    boxes = [""] * (len(links) + len(keys))
+    boxes[::2] = links
+    boxes[1::2] = keys
+
+    return "|".join(boxes)
+
+
+def as_list(items: Any) -> List[Any]:
+    """
+    A node's keys or data as a list of plain Python values; NumPy arrays are unboxed with tolist().
+    """
+    return items.tolist() if hasattr(items, "tolist") else list(items)
 
 
-def index_nodes(tree: BTree) -> Dict[Address, BTreeNode]:
-    return {node.my_addr: node for node in iterate(tree)}
+def escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"')
 
 
 def stringify(item: Any) -> str:
@@ -1 +1,28 @@
 __version__ = "0.2.0"
+
+# Public names are resolved on first access (PEP 562), so `import py_btrees` stays cheap
+# and optional dependencies such as numpy are only imported by the modules that need them.
+_EXPORTS = {
+    "BTree": "py_btrees.btree",
+    "BTreeNode": "py_btrees.btree_node",
+    "DISK": "py_btrees.disk",
+    "IndexedTable": "py_btrees.index",
+    "NumericBTree": "py_btrees.numeric",
+    "Prefetcher": "py_btrees.prefetch",
+    "TreeStats": "py_btrees.health",
+}
+
+__all__ = ["__version__", *_EXPORTS]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
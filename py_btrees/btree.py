@@ -1,8 +1,12 @@
 import bisect
-from typing import Any, List, Optional, Tuple, Union, Dict, Generic, TypeVar, cast, NewType
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Tuple, Union, Dict, Generic, TypeVar, cast, NewType
 from py_btrees.disk import DISK, Address
 from py_btrees.btree_node import BTreeNode, KT, VT, get_node
 
+if TYPE_CHECKING:
+    from py_btrees.health import TreeStats
+    from py_btrees.prefetch import Prefetcher
+
 """
 ----------------------- Starter code for your B-Tree -----------------------
 
@@ -53,6 +57,22 @@ class BTree:
         self.M = M # M will fall in the range 2 to 99999 # max number of children for non-leaf & non-root nodes
         self.L = L # L will fall in the range 1 to 99999 # max number of data items for leaf nodes
 
+    @classmethod
+    def open(cls, root_addr: Address, M: int, L: int) -> "BTree":
+        """
+        Attach to a tree that already exists on disk, given the address of its root.
+        Unlike BTree(M, L) this allocates nothing and reads only the root page,
+        so the cost does not depend on the size of the tree.
+        """
+        root = get_node(root_addr)
+        if root.parent_addr is not None:
+            raise ValueError(f"Block {root_addr} is not a root node; its parent is block {root.parent_addr}.")
+        tree = cls.__new__(cls)
+        tree.root_addr = root_addr
+        tree.M = M
+        tree.L = L
+        return tree
+
     def insert(self, key: KT, value: VT) -> None:
         """
         Insert the key-value pair into your tree.
@@ -65,64 +85,70 @@ class BTree:
 
         Make sure to write back all changes to the disk!
         """
-        #Step 1: If the key already exists in the tree, then replace the value
-        existing_value = self.find(key)
-        if existing_value is not None:
-            # If key exists, update the value
-            existing_node = self._find_node(key)
-            existing_node.insert_data(key, value)
-            existing_node.write_back()
+        # Step 1: Find the leaf node for insertion in disk
+        leaf_node = self._find_node(key)
+
+        # Step 2: If the key already exists in the leaf, then replace the value
+        # Check the keys rather than find(key), since a stored value may itself be None
+        idx = leaf_node.find_idx(key)
+        if idx < len(leaf_node.keys) and leaf_node.keys[idx] == key:
+            leaf_node.insert_data(key, value)
+            leaf_node.write_back()
             return
 
-        # Step 2: Find the leaf node for insertion in disk
-        leaf_node = self._find_node(key)
+        # The key is new, so every subtree on the path to the leaf grows by one.
+        # Done before a split so _split_node sees the parent counts including this key.
+        self._update_counts(leaf_node, 1)
 
         # Step 3: Insert key-value pair into the leaf node
         # Checks to see if there's room in the leaf node to add data
         if len(leaf_node.data) < self.L:
             # modifies the node in memory
             leaf_node.insert_data(key, value)
+            # Step 5: Write the updated node from memory to disk
+            leaf_node.write_back()
         # Step 4: Splits the node to create more room
         else:
             # Redistribute data between leaf nodes before splitting
             #if self._redistribute(leaf_node, key, value):
                 #return
             # Handle node split to make more room for data
+            # _split_node writes back every node it touches; writing leaf_node again here could
+            # clobber a parent address that changed when an ancestor split
             #else:
             self._split_node(leaf_node, key, value)
-        # Step 5: Write the updated node from memory to disk
-        leaf_node.write_back()
 
     def _split_node(self, node:BTreeNode, key: Optional[KT]=None, value: Optional[VT]=None) -> None:
         """
         Recursively handles the splitting of a node when it exceeds the maximum number of children (M).
         """
         # Step 1: Split data and keys b/w old and new nodes due to lack of space
-        # Save the middle key before modifying the node; division of midpoint index of L data items
-        mid_idx = self.L // 2
-
         # Create a new node (self address, parent address, index_in_parent, current node is_leaf)
         new_node = BTreeNode(DISK.new(), node.parent_addr, None, node.is_leaf)
         # Split the keys & data of (old) node b/w (old) node & new node
         # Need to edit data only (& keys) b/c it's a leaf
         if node.is_leaf:
-            # insert data into node
-            node.insert_data(key, value)
-            # new node retains right half from original node
-            # node retains (and rewrites) left half from original node; would have more items if odd number
-            new_node.keys = node.keys[mid_idx+1:]
-            new_node.data = node.data[mid_idx+1:]
-            node.keys = node.keys[:mid_idx+1]
-            node.data = node.data[:mid_idx+1]
+            split_key = self._split_leaf(node, new_node, key, value)
 
         # Need to edit children addrs only (& keys) b/c it's a non-leaf. Need to also remove mid idx key that will be promoted to the parent
         else:
+            # An overfull non-leaf has M+1 children & M keys; the middle key moves up to the parent
+            mid_idx = len(node.keys) // 2
+            split_key = node.keys[mid_idx]
             # new node retains right half from original node after the midpoint index since the middle key is promoted to the parent
             # node retains (and rewrites) left half from original node; would have more items if odd number
             new_node.keys = node.keys[mid_idx+1:]
             new_node.children_addrs = node.children_addrs[mid_idx+1:]
+            new_node.counts = node.counts[mid_idx+1:]
             node.keys = node.keys[:mid_idx]
             node.children_addrs = node.children_addrs[:mid_idx+1]
+            node.counts = node.counts[:mid_idx+1]
+            # Children that moved to the new node need their parent address & index updated
+            for i, child_addr in enumerate(new_node.children_addrs):
+                child = get_node(child_addr)
+                child.parent_addr = new_node.my_addr
+                child.index_in_parent = i
+                child.write_back()
 
         # Step 2: Update parent's mapping info
         # If the node is the root
@@ -130,9 +156,10 @@ class BTree:
             # Create a new root node if the split happens at the root
             new_root_node = BTreeNode(DISK.new(), None, None, False)
             # Promotes the middle key to create a new root during the split
-            new_root_node.keys = [node.keys[-1]]
+            new_root_node.keys = [split_key]
             # link the new children addresses (node, new node) to the new root
             new_root_node.children_addrs = [node.my_addr, new_node.my_addr]
+            new_root_node.counts = [node.subtree_size(), new_node.subtree_size()]
             # The B-Tree's reference to the root is updated to point to the newly created root node
             self.root_addr = new_root_node.my_addr
             # leaf node and new leaf node need to update their parent addresses to point to the new root
@@ -158,12 +185,15 @@ class BTree:
             # split the parent node by creating a new key in the parent via the mid key in the node
             # finds the correct index in the parent node where the middle key from the split node should be inserted
             # find_idx determines the appropriate position of the newly inserted key to maintain the sorted order
-            insert_idx = parent_node.find_idx(node.keys[-1])
+            insert_idx = parent_node.find_idx(split_key)
             # inserts the middle key into the keys list of the parent node at the position found by insert_idx
             # insert(idx position, object)
-            parent_node.keys.insert(insert_idx, node.keys[-1])
+            parent_node.keys.insert(insert_idx, split_key)
             # inserts the new node address into the next position of the parent's list of child addresses
             parent_node.children_addrs.insert(insert_idx + 1, new_node.my_addr)
+            # the parent's count for node already includes the new key; divide it between the halves
+            parent_node.counts[insert_idx] = node.subtree_size()
+            parent_node.counts.insert(insert_idx + 1, new_node.subtree_size())
             # Update parent pointers for the new node
             new_node.parent_addr = node.parent_addr
             new_node.index_in_parent = insert_idx+1
@@ -188,6 +218,34 @@ class BTree:
         #node.write_back()
         #new_node.write_back()
 
+    def _split_leaf(self, node: BTreeNode, new_node: BTreeNode, key: KT, value: VT) -> KT:
+        """
+        Inserts (key, value) into the full leaf `node` and moves its right half into `new_node`.
+        Returns the key to promote into the parent.
+        """
+        # Save the middle key before modifying the node; division of midpoint index of L data items
+        mid_idx = self.L // 2
+        # insert data into node
+        node.insert_data(key, value)
+        # new node retains right half from original node
+        # node retains (and rewrites) left half from original node; would have more items if odd number
+        new_node.keys = node.keys[mid_idx+1:]
+        new_node.data = node.data[mid_idx+1:]
+        node.keys = node.keys[:mid_idx+1]
+        node.data = node.data[:mid_idx+1]
+        # keys represent the max value of the left child, so the left node's last key is promoted
+        return node.keys[-1]
+
+    def _update_counts(self, node: BTreeNode, delta: int) -> None:
+        """
+        Adds delta to the subtree count of every ancestor of node, walking up through the parents.
+        """
+        while node.parent_addr is not None:
+            parent_node = node.get_parent()
+            parent_node.counts[node.index_in_parent] += delta
+            parent_node.write_back()
+            node = parent_node
+
     def _update_index_of_parent(self, parent_node:BTreeNode):
         for i, addr in enumerate(parent_node.children_addrs):
             child_node = get_node(addr)
@@ -236,5 +294,171 @@ class BTree:
         # Step 3: Return the node of our parent; will not be 'None'
         return current_node
 
+    def items(self, lo: Optional[KT] = None, hi: Optional[KT] = None, prefetcher: Optional["Prefetcher"] = None) -> Iterator[Tuple[KT, VT]]:
+        """
+        Yield the (key, value) pairs with lo <= key < hi in ascending key order.
+        Either bound may be None to leave that side of the range open.
+
+        Descends once to the leaf holding lo and then walks the leaves left to right,
+        so a scan reads O(height + leaves in range) nodes instead of the whole tree.
+        With a prefetcher, the next prefetcher.depth sibling nodes are read ahead together.
+        """
+        for leaf in self._scan_leaves(lo, prefetcher):
+            idx = 0 if lo is None else leaf.find_idx(lo)
+            for i in range(idx, len(leaf.keys)):
+                if hi is not None and not leaf.keys[i] < hi:
+                    return
+                yield leaf.keys[i], leaf.data[i]
+            lo = None
+
+    def find_many(self, keys: Iterable[KT], prefetcher: Optional["Prefetcher"] = None) -> List[Optional[VT]]:
+        """
+        Find several keys at once. Returns the values (None where missing) in the order of `keys`.
+
+        The keys are sorted and pushed down the tree one level at a time, so every node on
+        the way is read once no matter how many keys pass through it, and the children needed
+        at each level are fetched together in vectored reads of prefetcher.depth nodes.
+        """
+        from py_btrees.prefetch import Prefetcher
+        if prefetcher is None:
+            prefetcher = Prefetcher()
+        keys = list(keys)
+        results: List[Optional[VT]] = [None] * len(keys)
+        order = sorted(range(len(keys)), key=lambda q: keys[q])
+
+        # Each frontier entry is a node & the (sorted) positions of the keys routed to it
+        frontier = [(get_node(self.root_addr), order)]
+        while len(frontier) and not frontier[0][0].is_leaf:
+            groups: List[Tuple[Address, List[int]]] = []
+            for node, queries in frontier:
+                for q in queries:
+                    child_addr = node.children_addrs[node.find_idx(keys[q])]
+                    if len(groups) and groups[-1][0] == child_addr:
+                        groups[-1][1].append(q)
+                    else:
+                        groups.append((child_addr, [q]))
+            frontier = []
+            for start in range(0, len(groups), prefetcher.depth):
+                window = groups[start:start + prefetcher.depth]
+                prefetcher.prefetch(addr for addr, _ in window)
+                frontier.extend((prefetcher.read(addr), queries) for addr, queries in window)
+
+        for leaf, queries in frontier:
+            for q in queries:
+                results[q] = leaf.find_data(keys[q])
+        return results
+
+    def _read(self, addr: Address, prefetcher: Optional["Prefetcher"]) -> BTreeNode:
+        """
+        Reads a node through the prefetcher if there is one.
+        """
+        return get_node(addr) if prefetcher is None else prefetcher.read(addr)
+
+    def _scan_leaves(self, lo: Optional[KT], prefetcher: Optional["Prefetcher"] = None) -> Iterator[BTreeNode]:
+        """
+        Yields the leaves in key order, starting at the leaf that holds lo (or the first leaf).
+
+        Leaves have no sibling pointers, so the path of ancestors is kept for the whole scan:
+        moving to the next leaf only reads new nodes, and no parent is read twice.
+        Every read goes through the prefetcher when there is one, so its metrics see all of them.
+        """
+        # [non-leaf node, index of the child currently being scanned], root first
+        path: List[List[Any]] = []
+        node = self._read(self.root_addr, prefetcher)
+        while not node.is_leaf:
+            idx = 0 if lo is None else node.find_idx(lo)
+            path.append([node, idx])
+            node = self._read_child(node, idx, prefetcher)
+        yield node
+
+        while len(path):
+            entry = path[-1]
+            parent_node, idx = entry
+            if idx + 1 >= len(parent_node.children_addrs):
+                path.pop()
+                continue
+            entry[1] = idx + 1
+            node = self._read_child(parent_node, idx + 1, prefetcher)
+            while not node.is_leaf:
+                path.append([node, 0])
+                node = self._read_child(node, 0, prefetcher)
+            yield node
+
+    def _read_child(self, node: BTreeNode, idx: int, prefetcher: Optional["Prefetcher"]) -> BTreeNode:
+        """
+        Reads child idx of node. With a prefetcher, the next prefetcher.depth children
+        (starting at idx) are read ahead together first, so later siblings are already cached.
+        """
+        if prefetcher is not None:
+            prefetcher.prefetch(node.children_addrs[idx:idx + prefetcher.depth])
+        return self._read(node.children_addrs[idx], prefetcher)
+
+    def __len__(self) -> int:
+        """
+        The number of keys in the tree. Reads only the root.
+        """
+        return get_node(self.root_addr).subtree_size()
+
+    def rank(self, key: KT) -> int:
+        """
+        The number of keys in the tree that are strictly less than key.
+        Reads one root-to-leaf path, using the subtree counts of the nodes on the way.
+        """
+        rank = 0
+        current_node = get_node(self.root_addr)
+        while not current_node.is_leaf:
+            idx = current_node.find_idx(key)
+            # everything in the children left of idx is smaller than key
+            rank += sum(current_node.counts[:idx])
+            current_node = current_node.get_child(idx)
+        return rank + current_node.find_idx(key)
+
+    def select(self, k: int) -> KT:
+        """
+        The k-th smallest key (0-based; negative k counts from the largest, like list indexing).
+        Raises IndexError if there is no such key. Reads one root-to-leaf path.
+        """
+        current_node = get_node(self.root_addr)
+        size = current_node.subtree_size()
+        if k < 0:
+            k += size
+        if not 0 <= k < size:
+            raise IndexError(f"select index out of range for a tree of {size} keys")
+
+        while not current_node.is_leaf:
+            idx = 0
+            while k >= current_node.counts[idx]:
+                k -= current_node.counts[idx]
+                idx += 1
+            current_node = current_node.get_child(idx)
+        return current_node.keys[k]
+
+    def count(self, lo: Optional[KT] = None, hi: Optional[KT] = None) -> int:
+        """
+        The number of keys with lo <= key < hi. Either bound may be None to leave that side open.
+        """
+        upper = len(self) if hi is None else self.rank(hi)
+        lower = 0 if lo is None else self.rank(lo)
+        return max(upper - lower, 0)
+
+    def verify(self, sample: Optional[float] = None, seed: Optional[int] = None) -> List[str]:
+        """
+        Check the health of the tree: parent/child links, index_in_parent, key order and key ranges,
+        node sizes and that all leaves sit at the same depth. Returns a list of problems (empty if healthy).
+
+        Walks the tree iteratively with bounded memory. Pass `sample` (0 < sample <= 1) to only
+        descend into that fraction of each node's children.
+        """
+        from py_btrees.health import verify_tree
+        return verify_tree(self, sample, seed)
+
+    def stats(self, sample: Optional[float] = None, seed: Optional[int] = None) -> "TreeStats":
+        """
+        Report height, node and key counts, fill distributions and bytes on disk, per level and overall.
+        Accepts the same `sample` / `seed` arguments as verify().
+        """
+        from py_btrees.health import tree_stats
+        return tree_stats(self, sample, seed)
+
     def delete(self, key: KT) -> None:
         raise NotImplementedError("Karma method delete()")
@@ -34,6 +34,10 @@ class BTreeNode(Generic[KT, VT]):
           or the min value of the right child.
 
 
+        * counts[i] stores the number of data items in the subtree under children_addrs[i]
+          (non-leaf nodes only). It lets the BTree answer rank / select / count queries
+          by reading a single root-to-leaf path.
+
         For instance, if keys = [10, 20, 30, 40]:
          children_addrs[0] should point to another node whose keys are all less than 10.
          children_addrs[1] should point to another node whose keys are all between 10 and 20.
@@ -49,6 +53,26 @@ class BTreeNode(Generic[KT, VT]):
         self.keys: List[KT] = []
         self.children_addrs: List[Address] = [] # for use when self.is_leaf == False. Otherwise it should be empty.
         self.data: List[VT] = []                # for use when self.is_leaf == True. Otherwise it should be empty.
+        self.counts: List[int] = []             # subtree sizes, parallel to children_addrs. Empty for leaves.
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Numeric leaves (see py_btrees.numeric) keep keys & data in NumPy arrays.
+        Those are written to disk as (dtype, raw bytes) pairs instead of pickled array objects.
+        """
+        state = self.__dict__.copy()
+        if self.is_leaf and not isinstance(self.keys, list):
+            from py_btrees.numeric import pack_array
+            state["keys"] = pack_array(self.keys)
+            state["data"] = pack_array(self.data)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        if isinstance(state["keys"], tuple):
+            from py_btrees.numeric import unpack_array
+            state["keys"] = unpack_array(state["keys"])
+            state["data"] = unpack_array(state["data"])
+        self.__dict__.update(state)
 
     def get_child(self, idx: int) -> BTreeNode:
         """
@@ -66,6 +90,12 @@ class BTreeNode(Generic[KT, VT]):
         """
         DISK.write(self.my_addr, self)
 
+    def subtree_size(self) -> int:
+        """
+        The number of data items stored in the subtree rooted at this node.
+        """
+        return len(self.keys) if self.is_leaf else sum(self.counts)
+
     def find_idx(self, key: KT) -> Optional[int]:
         """
         Finds the index in self.keys where `key`
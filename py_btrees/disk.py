@@ -43,6 +43,19 @@ class Disk:
             print(f"read {pickle.loads(block)} at block {addr}")
         return pickle.loads(block)
 
+    def read_many(self, addrs: List[Address]) -> List["BTreeNode"]:
+        """
+        Vectored read: fetch several blocks in one request, in the order given.
+        """
+        self.verify()
+        for addr in addrs:
+            if (addr >= len(self.memory)):
+                raise ValueError(f"Error: Memory address {addr} has not yet been allocated. You cannot read from it.")
+        blocks = [self.memory[addr] for addr in addrs]
+        if LOGGING:
+            print(f"read {len(blocks)} blocks at {list(addrs)}")
+        return [pickle.loads(block) for block in blocks]
+
     def write(self, addr: Address, data: "BTreeNode"):
         self.verify()
         if str(type(data)) != "<class 'py_btrees.btree_node.BTreeNode'>":
@@ -0,0 +1,177 @@
+"""
+Streaming health checks and statistics for a BTree.
+
+Both walks are iterative depth-first traversals with an explicit stack, so they
+never hit the recursion limit and hold at most O(height * M) pending addresses
+in memory, no matter how large the tree is. Passing `sample` descends into only
+that fraction of each node's children, which makes it cheap to spot-check very
+large trees; the root is always visited.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Tuple
+from py_btrees.disk import DISK, Address
+from py_btrees.btree_node import BTreeNode, get_node
+
+if TYPE_CHECKING:
+    from py_btrees.btree import BTree
+
+FILL_BUCKETS = 10
+
+
+@dataclass
+class LevelStats:
+    depth: int
+    nodes: int = 0
+    leaves: int = 0
+    keys: int = 0
+    bytes: int = 0
+    # fill[i] counts nodes whose fill ratio (keys / L for leaves, children / M otherwise)
+    # falls in [i / FILL_BUCKETS, (i + 1) / FILL_BUCKETS); completely full nodes land in the last bucket
+    fill: List[int] = field(default_factory=lambda: [0] * FILL_BUCKETS)
+
+
+@dataclass
+class TreeStats:
+    height: int = 0
+    nodes: int = 0
+    leaves: int = 0
+    keys: int = 0
+    bytes: int = 0
+    sample: Optional[float] = None
+    levels: List[LevelStats] = field(default_factory=list)
+
+
+# (node address, depth, exclusive lower key bound, inclusive upper key bound, expected parent, expected index,
+#  subtree size recorded in the parent's counts)
+_Frame = Tuple[Address, int, Optional[Any], Optional[Any], Optional[Address], Optional[int], Optional[int]]
+
+
+def _walk(tree: "BTree", sample: Optional[float], seed: Optional[int]) -> Iterator[Tuple[BTreeNode, _Frame]]:
+    """
+    Yields every visited node together with the frame it was reached from, in key order.
+
+    A node is only descended into if its my_addr, parent_addr and index_in_parent agree with
+    the slot it was reached from. Each slot then leads to at most one descent, so a corrupted
+    child pointer back to an ancestor (or a shared child) cannot make the walk loop forever.
+    """
+    rng = random.Random(seed)
+    stack: List[_Frame] = [(tree.root_addr, 0, None, None, None, None, None)]
+    while stack:
+        frame = stack.pop()
+        addr, depth, lo, hi, _, _, _ = frame
+        node = get_node(addr)
+        yield node, frame
+        if not _linked(node, frame):
+            continue
+
+        # Push children right to left so they are popped left to right
+        for i in range(len(node.children_addrs) - 1, -1, -1):
+            if sample is not None and rng.random() >= sample:
+                continue
+            child_lo = node.keys[i-1] if 0 < i <= len(node.keys) else lo
+            child_hi = node.keys[i] if i < len(node.keys) else hi
+            count = node.counts[i] if i < len(node.counts) else None
+            stack.append((node.children_addrs[i], depth + 1, child_lo, child_hi, addr, i, count))
+
+
+def _linked(node: BTreeNode, frame: _Frame) -> bool:
+    """
+    Whether node points back at the slot (parent, index) of the frame it was reached from.
+    """
+    addr, _, _, _, parent_addr, index, _ = frame
+    return node.my_addr == addr and node.parent_addr == parent_addr and node.index_in_parent == index
+
+
+def verify_tree(tree: "BTree", sample: Optional[float] = None, seed: Optional[int] = None) -> List[str]:
+    """
+    Checks the BTree invariants (including the subtree counts) and returns a description of every violation found.
+    An empty list means the (visited part of the) tree is healthy.
+    """
+    problems: List[str] = []
+    leaf_depth: Optional[int] = None
+
+    for node, frame in _walk(tree, sample, seed):
+        addr, depth, lo, hi, parent_addr, index, count = frame
+
+        def problem(msg: str) -> None:
+            problems.append(f"node {addr} (depth {depth}): {msg}")
+
+        if node.my_addr != addr:
+            problem(f"my_addr is {node.my_addr}")
+        if node.parent_addr != parent_addr:
+            problem(f"parent_addr is {node.parent_addr}, expected {parent_addr}")
+        if node.index_in_parent != index:
+            problem(f"index_in_parent is {node.index_in_parent}, expected {index}")
+        if not node.is_leaf and not _linked(node, frame):
+            problem("children not checked because the node is not linked to this slot")
+
+        keys = node.keys
+        if any(not keys[i] < keys[i+1] for i in range(len(keys) - 1)):
+            problem("keys are not strictly increasing")
+        if len(keys) and ((lo is not None and not lo < keys[0]) or (hi is not None and not keys[-1] <= hi)):
+            problem(f"keys [{keys[0]!r} .. {keys[-1]!r}] fall outside ({lo!r}, {hi!r}]")
+
+        is_root = parent_addr is None
+        if node.is_leaf:
+            if leaf_depth is None:
+                leaf_depth = depth
+            elif depth != leaf_depth:
+                problem(f"leaf at depth {depth}, other leaves are at depth {leaf_depth}")
+            if len(node.children_addrs):
+                problem("leaf has children")
+            if len(keys) != len(node.data):
+                problem(f"{len(keys)} keys but {len(node.data)} data items")
+            if len(keys) > tree.L:
+                problem(f"{len(keys)} data items, more than L={tree.L}")
+            if not is_root and len(keys) < (tree.L + 1) // 2:
+                problem(f"{len(keys)} data items, fewer than {(tree.L + 1) // 2}")
+        else:
+            n_children = len(node.children_addrs)
+            if len(node.data):
+                problem("non-leaf has data items")
+            if len(node.counts) != n_children:
+                problem(f"{len(node.counts)} subtree counts but {n_children} children")
+            if len(keys) != n_children - 1:
+                problem(f"{len(keys)} keys but {n_children} children")
+            if n_children > tree.M:
+                problem(f"{n_children} children, more than M={tree.M}")
+            if n_children < (2 if is_root else (tree.M + 1) // 2):
+                problem(f"{n_children} children, too few")
+
+        # Checking each node against its parent's count covers every count in the tree
+        if parent_addr is not None and count != node.subtree_size():
+            problem(f"subtree holds {node.subtree_size()} items but the parent counts {count}")
+    return problems
+
+
+def tree_stats(tree: "BTree", sample: Optional[float] = None, seed: Optional[int] = None) -> TreeStats:
+    """
+    Collects height, node/leaf/key counts, fill histograms and on-disk bytes, overall and per level.
+    With `sample`, the counts cover only the visited nodes.
+    """
+    stats = TreeStats(sample=sample)
+    for node, (addr, depth, _, _, _, _, _) in _walk(tree, sample, seed):
+        while len(stats.levels) <= depth:
+            stats.levels.append(LevelStats(depth=len(stats.levels)))
+        level = stats.levels[depth]
+
+        size = len(DISK.memory[addr])
+        if node.is_leaf:
+            fill = len(node.keys) / tree.L
+            level.leaves += 1
+            level.keys += len(node.keys)
+        else:
+            fill = len(node.children_addrs) / tree.M
+        level.nodes += 1
+        level.bytes += size
+        level.fill[min(int(fill * FILL_BUCKETS), FILL_BUCKETS - 1)] += 1
+
+    stats.height = len(stats.levels)
+    for level in stats.levels:
+        stats.nodes += level.nodes
+        stats.leaves += level.leaves
+        stats.keys += level.keys
+        stats.bytes += level.bytes
+    return stats
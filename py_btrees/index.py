@@ -0,0 +1,164 @@
+"""
+Indexed tables: a primary BTree plus secondary BTrees that are kept in sync with it.
+
+Each secondary index is an ordinary BTree whose keys are tuples of the indexed
+field values followed by the primary key, e.g. (city, age, pk). Appending the
+primary key keeps every entry unique, and because tuples compare element by
+element, all entries sharing a prefix such as (city,) are contiguous and can
+be answered with a single range scan.
+
+The value stored in a secondary entry is a dict of the covered fields (the
+indexed fields plus any `include` fields), so covering lookups never read the
+primary tree. BTree has no delete yet, so when a row changes its index key the
+old entry is overwritten with None and skipped by scans (the same happens to entries
+rolled back after a failed insert).
+"""
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from py_btrees.btree import BTree
+from py_btrees.btree_node import KT, VT
+
+Field = Union[str, Callable[[Any], Any]]
+
+
+def get_field(row: Any, field: Field) -> Any:
+    """
+    Reads one field from a row: a callable is applied to the row, a name is looked up
+    as a mapping key for dict-like rows and as an attribute otherwise.
+    """
+    if callable(field):
+        return field(row)
+    if isinstance(row, Mapping):
+        return row[field]
+    return getattr(row, field)
+
+
+class SecondaryIndex:
+    def __init__(self, name: str, fields: Sequence[Field], include: Sequence[str], tree: BTree):
+        """
+        A declared secondary index. `fields` are the (possibly composite) key columns,
+        `include` are extra columns copied into each entry for covering lookups.
+        """
+        self.name = name
+        self.fields = tuple(fields)
+        self.include = tuple(include)
+        self.tree = tree
+
+    def key_of(self, row: VT) -> Tuple:
+        """
+        The index key of a row, not including the primary key suffix.
+        """
+        return tuple(get_field(row, f) for f in self.fields)
+
+    def covered(self, pk: KT, row: VT) -> Dict[str, Any]:
+        """
+        The column values stored alongside an entry, keyed by column name.
+        Callable key fields have no name and are only available through the key itself.
+        """
+        covered = {f: get_field(row, f) for f in self.fields if isinstance(f, str)}
+        for f in self.include:
+            covered[f] = get_field(row, f)
+        return covered
+
+
+class IndexedTable:
+    def __init__(self, M: int, L: int):
+        """
+        Create an empty table. M and L are used for the primary tree and every secondary tree.
+        """
+        self.M = M
+        self.L = L
+        self.primary = BTree(M, L)
+        self.indexes: Dict[str, SecondaryIndex] = {}
+
+    def add_index(self, name: str, on: Union[Field, Sequence[Field]], include: Sequence[str] = ()) -> SecondaryIndex:
+        """
+        Declare a secondary index called `name` on a single field or on a tuple of fields
+        (a composite key). Rows already in the table are indexed immediately.
+        """
+        if name in self.indexes:
+            raise ValueError(f"Index {name!r} already exists.")
+        fields = tuple(on) if isinstance(on, (tuple, list)) else (on,)
+        index = SecondaryIndex(name, fields, include, BTree(self.M, self.L))
+        for pk, row in self.primary.items():
+            index.tree.insert(index.key_of(row) + (pk,), index.covered(pk, row))
+        self.indexes[name] = index
+        return index
+
+    def insert(self, pk: KT, row: VT) -> None:
+        """
+        Insert or overwrite the row stored under primary key pk and update every secondary index.
+
+        All index keys are computed before anything is written, so a row that is missing an
+        indexed field raises without writing anything. Secondary entries are written before
+        the primary row; if one of them fails (e.g. a key that does not compare with the keys
+        already in that index), the entries written so far are rolled back and the primary
+        tree is left untouched.
+        """
+        old_row = self.primary.find(pk)
+        updates = []
+        for index in self.indexes.values():
+            old_key = index.key_of(old_row) if old_row is not None else None
+            updates.append((index, old_key, index.key_of(row), index.covered(pk, row)))
+
+        done = []
+        try:
+            for update in updates:
+                index, old_key, new_key, covered = update
+                index.tree.insert(new_key + (pk,), covered)
+                done.append(update)
+                if old_key is not None and old_key != new_key:
+                    # No delete in BTree yet, so the stale entry is tombstoned with None
+                    index.tree.insert(old_key + (pk,), None)
+        except Exception:
+            for index, old_key, new_key, _ in reversed(done):
+                if old_key != new_key:
+                    index.tree.insert(new_key + (pk,), None)
+                if old_key is not None:
+                    index.tree.insert(old_key + (pk,), index.covered(pk, old_row))
+            raise
+        self.primary.insert(pk, row)
+
+    def find(self, pk: KT) -> Optional[VT]:
+        """
+        Return the row stored under primary key pk, or None.
+        """
+        return self.primary.find(pk)
+
+    def scan(self, name: str, prefix: Any = ()) -> Iterator[Tuple[KT, Dict[str, Any]]]:
+        """
+        Yield (pk, covered columns) for every entry of index `name` whose key starts with
+        `prefix`, in index order. A scalar prefix is treated as a 1-tuple, and an empty
+        prefix scans the whole index. Only the secondary tree is read.
+        """
+        index = self.indexes[name]
+        prefix = prefix if isinstance(prefix, tuple) else (prefix,)
+        n = len(prefix)
+        lo = prefix if n else None
+        for key, covered in index.tree.items(lo):
+            if key[:n] != prefix:
+                return
+            if covered is not None:
+                yield key[-1], covered
+
+    def scan_range(self, name: str, lo: Optional[Any] = None, hi: Optional[Any] = None) -> Iterator[Tuple[KT, Dict[str, Any]]]:
+        """
+        Yield (pk, covered columns) for entries of index `name` whose key prefix lies in [lo, hi).
+        Bounds may be scalars, full keys or key prefixes, and either may be None.
+        """
+        index = self.indexes[name]
+        lo = lo if lo is None or isinstance(lo, tuple) else (lo,)
+        hi = hi if hi is None or isinstance(hi, tuple) else (hi,)
+        for key, covered in index.tree.items(lo):
+            if hi is not None and not key[:len(hi)] < hi:
+                return
+            if covered is not None:
+                yield key[-1], covered
+
+    def lookup(self, name: str, prefix: Any = ()) -> List[Tuple[KT, VT]]:
+        """
+        Return (pk, row) for every row matching `prefix` on index `name`.
+        Unlike scan(), this reads the full row from the primary tree.
+        """
+        return [(pk, self.primary.find(pk)) for pk, _ in self.scan(name, prefix)]
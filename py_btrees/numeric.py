@@ -0,0 +1,238 @@
+"""
+BTree variant for numeric keys & values (e.g. int64 timestamps -> float64 readings).
+
+Leaves of a NumericBTree keep `keys` and `data` as NumPy arrays instead of lists of
+boxed Python objects. Lookups inside a leaf use np.searchsorted, find_many_arrays()
+resolves every query that lands in a leaf with one vectorized search, range scans
+hand out slices that share memory with the leaf, and sum/min/max over a key range
+are reduced leaf by leaf without materializing the range.
+
+Non-leaf nodes are unchanged, so the descent and split logic is shared with BTree.
+NumPy is an optional dependency; it is only needed once this module is used.
+"""
+
+from typing import Any, Iterator, Optional, Tuple
+from py_btrees.btree import BTree
+from py_btrees.btree_node import BTreeNode, get_node
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+
+def pack_array(arr: "np.ndarray") -> Tuple[str, bytes]:
+    """
+    The on-disk form of a leaf array: its dtype string and raw buffer.
+    """
+    return arr.dtype.str, arr.tobytes()
+
+
+def unpack_array(packed: Tuple[str, bytes]) -> "np.ndarray":
+    """
+    Inverse of pack_array. The result is a read-only view over the stored bytes, not a copy.
+    """
+    dtype, buf = packed
+    return np.frombuffer(buf, dtype=dtype)
+
+
+def exact_scalar(dtype: "np.dtype", x: Any, what: str) -> Any:
+    """
+    Converts x to a scalar of dtype, raising ValueError if x is not a number dtype can hold.
+
+    Integer dtypes must hold x exactly (no fractional keys, no overflow). Floating dtypes
+    round as usual, but reject strings and finite values that would overflow to inf.
+    """
+    if isinstance(x, (str, bytes)):
+        raise ValueError(f"{what} {x!r} is not a number.")
+    try:
+        with np.errstate(over="ignore"):
+            cast = dtype.type(x)
+    except (OverflowError, TypeError, ValueError) as e:
+        raise ValueError(f"{what} {x!r} cannot be stored as {dtype}.") from e
+
+    if dtype.kind == "f":
+        if np.isinf(cast) and np.isfinite(x):
+            raise ValueError(f"{what} {x!r} overflows {dtype}.")
+        return cast
+    # Compare as Python scalars, which compare ints & floats exactly (NumPy would round the int).
+    # NaN never equals itself, so let a NaN through when it stays NaN.
+    unboxed = cast.item()
+    if not (unboxed == x or (unboxed != unboxed and x != x)):
+        raise ValueError(f"{what} {x!r} cannot be stored exactly as {dtype}.")
+    return cast
+
+
+class NumericBTree(BTree):
+    def __init__(self, M: int, L: int, key_dtype: Any = "int64", value_dtype: Any = "float64"):
+        """
+        Initialize a new NumericBTree whose leaves store keys as `key_dtype`
+        and values as `value_dtype` NumPy arrays.
+        """
+        if np is None:
+            raise ImportError("NumericBTree requires numpy. Install it with `pip install numpy`.")
+        super().__init__(M, L)
+        self.key_dtype = np.dtype(key_dtype)
+        self.value_dtype = np.dtype(value_dtype)
+        root = get_node(self.root_addr)
+        root.keys = np.empty(0, dtype=self.key_dtype)
+        root.data = np.empty(0, dtype=self.value_dtype)
+        root.write_back()
+
+    @classmethod
+    def open(cls, root_addr: Any, M: int, L: int, key_dtype: Any = "int64", value_dtype: Any = "float64") -> "NumericBTree":
+        """
+        Attach to an existing NumericBTree on disk; see BTree.open().
+        """
+        if np is None:
+            raise ImportError("NumericBTree requires numpy. Install it with `pip install numpy`.")
+        tree = super().open(root_addr, M, L)
+        tree.key_dtype = np.dtype(key_dtype)
+        tree.value_dtype = np.dtype(value_dtype)
+        return tree
+
+    def insert(self, key: Any, value: Any) -> None:
+        """
+        Insert the key-value pair, overwriting the old value if the key exists.
+        Raises ValueError if the key or value is not a number the tree's dtypes can hold
+        (see exact_scalar).
+        """
+        key = exact_scalar(self.key_dtype, key, "Key")
+        value = exact_scalar(self.value_dtype, value, "Value")
+        leaf_node = self._find_node(key)
+        idx = int(np.searchsorted(leaf_node.keys, key))
+        if idx < len(leaf_node.keys) and leaf_node.keys[idx] == key:
+            # Arrays read from disk are read-only views, so copy before writing
+            leaf_node.data = leaf_node.data.copy()
+            leaf_node.data[idx] = value
+            leaf_node.write_back()
+            return
+
+        self._update_counts(leaf_node, 1)
+        if len(leaf_node.keys) < self.L:
+            leaf_node.keys = np.insert(leaf_node.keys, idx, key)
+            leaf_node.data = np.insert(leaf_node.data, idx, value)
+            leaf_node.write_back()
+        else:
+            self._split_node(leaf_node, key, value)
+
+    def _split_leaf(self, node: BTreeNode, new_node: BTreeNode, key: Any, value: Any) -> Any:
+        """
+        Array version of BTree._split_leaf. Both halves are slices of one array, and
+        the promoted key is unboxed so non-leaf key lists only hold Python scalars.
+        """
+        idx = int(np.searchsorted(node.keys, key))
+        keys = np.insert(node.keys, idx, key)
+        data = np.insert(node.data, idx, value)
+        mid_idx = self.L // 2 + 1
+        new_node.keys, new_node.data = keys[mid_idx:], data[mid_idx:]
+        node.keys, node.data = keys[:mid_idx], data[:mid_idx]
+        return node.keys[-1].item()
+
+    def find(self, key: Any) -> Optional[Any]:
+        """
+        Find a key and return the value associated with it, or None.
+        """
+        leaf_node = self._find_node(key)
+        idx = int(np.searchsorted(leaf_node.keys, key))
+        if idx < len(leaf_node.keys) and leaf_node.keys[idx] == key:
+            return leaf_node.data[idx].item()
+        return None
+
+    def _find_leaf_bounded(self, key: Any) -> Tuple[BTreeNode, Optional[Any]]:
+        """
+        Like _find_node, but also returns the largest key that would route to the same leaf
+        (None for the rightmost leaf). Keys represent the max value of the left child, so
+        this is the last separator taken on the way down.
+        """
+        node = get_node(self.root_addr)
+        upper = None
+        while not node.is_leaf:
+            idx = node.find_idx(key)
+            if idx < len(node.keys):
+                upper = node.keys[idx]
+            node = node.get_child(idx)
+        return node, upper
+
+    def find_many_arrays(self, keys: Any) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Look up a batch of keys. Returns (values, found) arrays in the order of `keys`;
+        values where found is False are NaN (or 0 for non-float value dtypes). Queries the
+        key dtype cannot hold exactly are reported as not found.
+        BTree.find_many() still works on a NumericBTree and returns a list like it does for BTree.
+
+        The queries are sorted once, and every query that routes to the same leaf is
+        answered by a single np.searchsorted, so each leaf is read at most once.
+        """
+        raw = np.asarray(keys)
+        if raw.dtype == object or not np.can_cast(raw.dtype, self.key_dtype, "safe"):
+            # Same rules as insert(): a query the key dtype cannot hold (e.g. 5.5 for int64
+            # keys) is never found, rather than being truncated onto a neighbouring key
+            queries = np.zeros(len(raw), dtype=self.key_dtype)
+            valid = np.zeros(len(raw), dtype=bool)
+            for q, key in enumerate(raw.tolist()):
+                try:
+                    queries[q] = exact_scalar(self.key_dtype, key, "Key")
+                    valid[q] = True
+                except ValueError:
+                    pass
+            candidates = np.flatnonzero(valid)
+        else:
+            queries = raw.astype(self.key_dtype)
+            candidates = np.arange(len(raw))
+        order = candidates[np.argsort(queries[candidates], kind="stable")]
+        sorted_queries = queries[order]
+        n = len(sorted_queries)
+        fill = np.nan if self.value_dtype.kind == "f" else 0
+        values = np.full(len(queries), fill, dtype=self.value_dtype)
+        found = np.zeros(len(queries), dtype=bool)
+
+        i = 0
+        while i < n:
+            leaf_node, upper = self._find_leaf_bounded(sorted_queries[i].item())
+            j = n if upper is None else int(np.searchsorted(sorted_queries, upper, side="right"))
+            batch = sorted_queries[i:j]
+            if len(leaf_node.keys):
+                pos = np.searchsorted(leaf_node.keys, batch)
+                clipped = np.minimum(pos, len(leaf_node.keys) - 1)
+                hit = (pos < len(leaf_node.keys)) & (leaf_node.keys[clipped] == batch)
+                values[order[i:j][hit]] = leaf_node.data[clipped[hit]]
+                found[order[i:j]] = hit
+            i = j
+        return values, found
+
+    def range(self, lo: Optional[Any] = None, hi: Optional[Any] = None) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+        """
+        Yield (keys, values) array pairs covering lo <= key < hi, one pair per leaf.
+        The arrays are read-only slices of the leaf buffers, not copies.
+        """
+        for leaf_node in self._scan_leaves(lo):
+            start = 0 if lo is None else int(np.searchsorted(leaf_node.keys, lo))
+            end = len(leaf_node.keys) if hi is None else int(np.searchsorted(leaf_node.keys, hi))
+            if end > start:
+                yield leaf_node.keys[start:end], leaf_node.data[start:end]
+            if end < len(leaf_node.keys):
+                return
+            lo = None
+
+    def aggregate(self, op: str, lo: Optional[Any] = None, hi: Optional[Any] = None) -> Optional[Any]:
+        """
+        Reduce the values with lo <= key < hi using op, one of "sum", "min", "max" or "count".
+        Each leaf slice is reduced with NumPy and only the per-leaf results are combined.
+        Returns None for "min"/"max" over an empty range.
+        """
+        reducers = {
+            "sum": (np.sum, lambda a, b: a + b),
+            "min": (np.min, min),
+            "max": (np.max, max),
+            "count": (len, lambda a, b: a + b),
+        }
+        if op not in reducers:
+            raise ValueError(f"Unknown aggregate {op!r}. Expected one of {sorted(reducers)}.")
+        reduce_leaf, combine = reducers[op]
+
+        result = 0 if op in ("sum", "count") else None
+        for _, values in self.range(lo, hi):
+            part = reduce_leaf(values)
+            result = part if result is None else combine(result, part)
+        return result.item() if hasattr(result, "item") else result
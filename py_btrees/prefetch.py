@@ -0,0 +1,65 @@
+"""
+Read-ahead for read-only BTree workloads.
+
+A Prefetcher is created for one scan or batch lookup and passed to BTree.items()
+or BTree.find_many(). Whenever the tree knows which nodes it will need next (the
+next sibling leaves of a scan, or every child a batch of keys descends into), it
+hands their addresses to the prefetcher, which fetches them with one vectored
+DISK.read_many() and keeps the decoded nodes until they are read.
+
+Cached nodes are not invalidated by writes, so do not insert into the tree while
+a prefetcher that has been used on it is still in use.
+"""
+
+from collections import OrderedDict
+from typing import Iterable, Optional
+from py_btrees.disk import DISK, Address
+from py_btrees.btree_node import BTreeNode, get_node
+
+
+class Prefetcher:
+    def __init__(self, depth: int = 8, capacity: Optional[int] = None):
+        """
+        depth is how many nodes ahead a scan reads at a time (and the batch size for
+        batched descents). At most `capacity` nodes (default 4 * depth) are held;
+        older unread ones are dropped first.
+        """
+        if depth < 1:
+            raise ValueError(f"Prefetch depth must be at least 1, not {depth}.")
+        self.depth = depth
+        self.capacity = capacity if capacity is not None else 4 * depth
+        self.cache: "OrderedDict[Address, BTreeNode]" = OrderedDict()
+        self.issued = 0   # nodes read ahead of time
+        self.used = 0     # prefetched nodes that were then read
+        self.misses = 0   # reads that had to go to disk individually
+
+    @property
+    def wasted(self) -> int:
+        """
+        Prefetched nodes that have not (or not yet) been read.
+        """
+        return self.issued - self.used
+
+    def prefetch(self, addrs: Iterable[Address]) -> None:
+        """
+        Read every address that is not already cached with a single vectored read.
+        """
+        wanted = [addr for addr in dict.fromkeys(addrs) if addr not in self.cache]
+        if not wanted:
+            return
+        for addr, node in zip(wanted, DISK.read_many(wanted)):
+            self.cache[addr] = node
+        self.issued += len(wanted)
+        while len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+
+    def read(self, addr: Address) -> BTreeNode:
+        """
+        Return the node at addr, from the cache if it was prefetched and from disk otherwise.
+        """
+        node = self.cache.pop(addr, None)
+        if node is not None:
+            self.used += 1
+            return node
+        self.misses += 1
+        return get_node(addr)
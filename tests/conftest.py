@@ -0,0 +1,19 @@
+from py_btrees.btree import BTree
+import random
+
+import pytest
+
+
+@pytest.fixture
+def make_tree():
+    """
+    Factory for a BTree(M, L) holding the keys 0..n-1 (inserted in random order) mapped to str(key).
+    """
+    def make(M, L, n=300):
+        btree = BTree(M, L)
+        keys = [i for i in range(n)]
+        random.shuffle(keys)
+        for k in keys:
+            btree.insert(k, str(k))
+        return btree
+    return make
@@ -274,4 +274,66 @@ def test_find(): #PASS
     assert btree.find(5) == "val5" # should find
     assert btree.find(15) == "val15"  # should find
     assert btree.find(7) is None # It exists, but is a non-leaf node. Therefore, should return None
-    assert btree.find(10) is None # Doesn't exist. Therefore, should return None
\ No newline at end of file
+    assert btree.find(10) is None # Doesn't exist. Therefore, should return None
+
+
+@pytest.mark.parametrize("M,L", [(2, 1), (3, 3), (4, 2), (6, 5)])
+def test_order_statistics(M, L):
+    btree = BTree(M, L)
+    keys = [i * 2 for i in range(150)]
+    random.shuffle(keys)
+    for k in keys:
+        btree.insert(k, str(k))
+        btree.insert(k, "overwritten") # overwriting must not change any counts
+    assert btree.verify() == []
+
+    assert len(btree) == 150
+    for k in range(0, 300, 7):
+        assert btree.rank(k) == (k + 1) // 2
+    for i in range(150):
+        assert btree.select(i) == i * 2
+    assert btree.select(-1) == 298
+    with pytest.raises(IndexError):
+        btree.select(150)
+
+    assert btree.count(10, 20) == 5
+    assert btree.count(11, 20) == 4
+    assert btree.count(None, 7) == 4
+    assert btree.count(290) == 5
+    assert btree.count() == 150
+    assert btree.count(20, 10) == 0
+
+
+@pytest.mark.parametrize("M,L", [(3, 1), (3, 3)])
+def test_overwrite_none_value(M, L):
+    btree = BTree(M, L)
+    for i in range(10):
+        btree.insert(i, str(i))
+
+    # a stored None must still count as an existing key
+    btree.insert(3, None)
+    btree.insert(3, "x")
+    btree.insert(3, None)
+    btree.insert(3, None)
+
+    assert len(btree) == 10
+    assert btree.find(3) is None
+    assert btree.select(3) == 3
+    assert btree.verify() == []
+
+
+def test_order_statistics_empty():
+    btree = BTree(3, 3)
+    assert len(btree) == 0
+    assert btree.count() == 0
+    with pytest.raises(IndexError):
+        btree.select(0)
+
+
+def test_items_range_scan(make_tree):
+    btree = make_tree(3, 2, 100)
+
+    assert [k for k, _ in btree.items()] == list(range(100))
+    assert list(btree.items(10, 15)) == [(i, str(i)) for i in range(10, 15)]
+    assert [k for k, _ in btree.items(95)] == list(range(95, 100))
+    assert list(btree.items(50, 50)) == []
@@ -0,0 +1,69 @@
+from py_btrees.disk import DISK
+import graph
+import io
+import json
+
+import pytest
+
+
+def test_iterate_depth_and_subtree(make_tree):
+    btree = make_tree(3, 3)
+    stats = btree.stats()
+
+    assert len(list(graph.iterate(btree))) == stats.nodes
+    assert len(list(graph.iterate(btree, max_depth=0))) == 1
+    assert len(list(graph.iterate(btree, max_depth=1))) == stats.levels[0].nodes + stats.levels[1].nodes
+
+    root = DISK.read(btree.root_addr)
+    subtree = list(graph.iterate_levels(btree, root.children_addrs[0]))
+    assert subtree[0][0] == 0
+    assert subtree[0][1].my_addr == root.children_addrs[0]
+    assert all(node.is_leaf for depth, node in subtree if depth == stats.height - 2)
+
+
+def test_create_depth_limited(make_tree):
+    btree = make_tree(3, 3)
+    g = graph.create(btree, max_depth=1)
+    source = g.source
+    assert "subtrees" in source
+    assert source.count("[label=") < len(list(graph.iterate(btree)))
+
+
+def test_write_dot_and_json(make_tree):
+    btree = make_tree(4, 2)
+    n_nodes = btree.stats().nodes
+
+    out = io.StringIO()
+    graph.write_dot(btree, out)
+    dot = out.getvalue()
+    assert dot.startswith("digraph btree {") and dot.endswith("}\n")
+    assert dot.count("shape=record") == 1
+    assert dot.count("->") == n_nodes - 1
+
+    out = io.StringIO()
+    graph.write_json(btree, out, max_depth=1)
+    nodes = json.loads(out.getvalue())
+    assert nodes[0]["addr"] == btree.root_addr and nodes[0]["depth"] == 0
+    assert {node["depth"] for node in nodes} == {0, 1}
+
+
+def test_summarize(make_tree):
+    btree = make_tree(3, 3)
+    source = graph.summarize(btree).source
+    for level in btree.stats().levels:
+        assert f"level{level.depth}" in source
+
+
+def test_write_json_numeric_leaves():
+    np = pytest.importorskip("numpy")
+    from py_btrees.numeric import NumericBTree
+
+    btree = NumericBTree(3, 3)
+    for k in range(20):
+        btree.insert(k, k / 2)
+
+    out = io.StringIO()
+    graph.write_json(btree, out)
+    leaves = [node for node in json.loads(out.getvalue()) if node["is_leaf"]]
+    assert sorted(k for leaf in leaves for k in leaf["keys"]) == list(range(20))
+    assert all(isinstance(v, float) for leaf in leaves for v in leaf["data"])
@@ -0,0 +1,58 @@
+from py_btrees.disk import DISK
+from py_btrees.health import FILL_BUCKETS
+
+import pytest
+
+
+@pytest.mark.parametrize("M,L", [(2, 1), (3, 3), (4, 2), (6, 6)])
+def test_verify_healthy(M, L, make_tree):
+    btree = make_tree(M, L, 500)
+    assert btree.verify() == []
+    assert btree.verify(sample=0.3, seed=1) == []
+
+
+def test_verify_reports_broken_links(make_tree):
+    btree = make_tree(3, 3, 500)
+    root = DISK.read(btree.root_addr)
+    child = DISK.read(root.children_addrs[1])
+    child.index_in_parent = 0
+    child.write_back()
+    leaf = btree._find_node(0)
+    leaf.keys = list(reversed(leaf.keys))
+    leaf.write_back()
+
+    problems = btree.verify()
+    assert any("index_in_parent" in p for p in problems)
+    assert any("strictly increasing" in p for p in problems)
+
+
+def test_stats(make_tree):
+    btree = make_tree(4, 4, 500)
+    stats = btree.stats()
+
+    assert stats.keys == 500
+    assert stats.height == len(stats.levels)
+    assert stats.levels[0].nodes == 1
+    assert stats.leaves == stats.levels[-1].nodes == stats.levels[-1].leaves
+    assert stats.nodes == sum(sum(level.fill) for level in stats.levels)
+    assert len(stats.levels[-1].fill) == FILL_BUCKETS
+    assert stats.bytes == sum(level.bytes for level in stats.levels) > 0
+
+    sampled = btree.stats(sample=0.5, seed=3)
+    assert sampled.sample == 0.5
+    assert sampled.levels[0].nodes == 1
+    assert sampled.nodes <= stats.nodes
+
+
+@pytest.mark.parametrize("target", ["root", "sibling", "self"])
+def test_verify_terminates_on_cycles(make_tree, target):
+    btree = make_tree(3, 3, 100)
+    root = DISK.read(btree.root_addr)
+    node = DISK.read(root.children_addrs[0])
+    addrs = {"root": btree.root_addr, "sibling": root.children_addrs[1], "self": node.my_addr}
+    node.children_addrs[-1] = addrs[target]
+    node.write_back()
+
+    problems = btree.verify()
+    assert any("not linked" in p for p in problems)
+    assert btree.stats().nodes > 0
@@ -0,0 +1,100 @@
+from py_btrees.index import IndexedTable
+
+import pytest
+
+
+def make_people(M, L):
+    table = IndexedTable(M, L)
+    table.add_index("by_city", "city", include=["name"])
+    table.add_index("by_city_age", ("city", "age"))
+    cities = ["austin", "boston", "chicago"]
+    for pk in range(60):
+        table.insert(pk, {"name": f"p{pk}", "city": cities[pk % 3], "age": 20 + pk % 7})
+    return table
+
+
+def test_secondary_index_lookup():
+    table = make_people(3, 3)
+
+    austin = [pk for pk, _ in table.scan("by_city", "austin")]
+    assert austin == [pk for pk in range(60) if pk % 3 == 0]
+    # covering lookup: the included column comes back without reading the primary tree
+    assert all(covered["name"] == f"p{pk}" for pk, covered in table.scan("by_city", "austin"))
+
+    rows = table.lookup("by_city", "boston")
+    assert all(row["city"] == "boston" for _, row in rows)
+    assert len(rows) == 20
+
+
+def test_composite_prefix_and_range():
+    table = make_people(4, 4)
+
+    exact = [pk for pk, _ in table.scan("by_city_age", ("chicago", 22))]
+    assert exact == [pk for pk in range(60) if pk % 3 == 2 and 20 + pk % 7 == 22]
+
+    prefix = [pk for pk, _ in table.scan("by_city_age", ("chicago",))]
+    assert sorted(prefix) == [pk for pk in range(60) if pk % 3 == 2]
+
+    ages = [c["age"] for _, c in table.scan_range("by_city_age", ("austin", 21), ("austin", 24))]
+    assert ages == sorted(ages)
+    assert set(ages) == {21, 22, 23}
+
+
+def test_overwrite_moves_index_entries():
+    table = make_people(3, 2)
+    table.insert(0, {"name": "moved", "city": "boston", "age": 99})
+
+    assert 0 not in [pk for pk, _ in table.scan("by_city", "austin")]
+    assert (0, {"city": "boston", "name": "moved"}) in list(table.scan("by_city", "boston"))
+    assert [pk for pk, _ in table.scan("by_city_age", ("boston", 99))] == [0]
+
+
+def test_add_index_backfills_and_rejects_bad_rows():
+    table = make_people(3, 3)
+    table.add_index("by_age", "age")
+    assert len(list(table.scan("by_age", 20))) == len([pk for pk in range(60) if pk % 7 == 0])
+
+    with pytest.raises(KeyError):
+        table.insert(1000, {"name": "nobody"})
+    # nothing was written for the rejected row
+    assert table.find(1000) is None
+
+
+@pytest.mark.parametrize("M,L", [(3, 1), (3, 3)])
+def test_row_moves_back_and_forth(M, L):
+    table = IndexedTable(M, L)
+    table.add_index("by_city", "city")
+    for pk in range(20):
+        table.insert(pk, {"city": "a" if pk % 2 else "b"})
+
+    for city in ["b", "a", "b", "a"]:
+        table.insert(1, {"city": city})
+
+    assert 1 in [pk for pk, _ in table.scan("by_city", "a")]
+    assert 1 not in [pk for pk, _ in table.scan("by_city", "b")]
+    index = table.indexes["by_city"].tree
+    # live entries plus one tombstone for (b, 1)
+    assert len(index) == 21
+    assert index.verify() == []
+    assert table.primary.verify() == []
+
+
+def test_failed_secondary_insert_rolls_back():
+    table = IndexedTable(3, 3)
+    table.add_index("by_city", "city")
+    table.add_index("by_name", "name")
+    table.insert(1, {"city": "a", "name": "x"})
+    table.insert(2, {"city": "a", "name": "y"})
+
+    # None does not compare with the strings already indexed. The first insert fails on the
+    # second index after the city index was updated, the second fails on the first index.
+    with pytest.raises(TypeError):
+        table.insert(2, {"city": "b", "name": None})
+    with pytest.raises(TypeError):
+        table.insert(3, {"city": None, "name": "z"})
+
+    assert table.find(2) == {"city": "a", "name": "y"}
+    assert table.find(3) is None
+    assert [pk for pk, _ in table.scan("by_city", "a")] == [1, 2]
+    assert list(table.scan("by_city", "b")) == []
+    assert [c["name"] for _, c in table.scan("by_name")] == ["x", "y"]
@@ -0,0 +1,107 @@
+from py_btrees.disk import DISK
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+from py_btrees.numeric import NumericBTree
+from py_btrees.prefetch import Prefetcher
+
+
+def make_series(M, L, n=200):
+    btree = NumericBTree(M, L)
+    keys = [i * 10 for i in range(n)]
+    random.shuffle(keys)
+    for k in keys:
+        btree.insert(k, k / 10)
+    return btree
+
+
+@pytest.mark.parametrize("M,L", [(3, 3), (4, 2), (5, 8), (2, 1)])
+def test_numeric_insert_and_find(M, L):
+    btree = make_series(M, L)
+    for k in range(0, 2000, 10):
+        assert btree.find(k) == k / 10
+    assert btree.find(5) is None
+
+    btree.insert(100, -1.0)
+    assert btree.find(100) == -1.0
+    assert len(btree) == 200
+    assert btree.select(10) == 100
+    assert btree.verify() == []
+
+    # leaves are stored as raw buffers and come back as arrays
+    leaf = btree._find_node(0)
+    assert isinstance(leaf.keys, np.ndarray)
+    assert leaf.keys.dtype == np.int64 and leaf.data.dtype == np.float64
+    # non-leaf nodes keep plain Python keys
+    root = DISK.read(btree.root_addr)
+    assert not root.is_leaf
+    assert all(type(k) is int for k in root.keys)
+
+
+def test_numeric_find_many():
+    btree = make_series(4, 4)
+    queries = [1990, 5, 0, 730, 2000, 730]
+    values, found = btree.find_many_arrays(queries)
+    assert found.tolist() == [True, False, True, True, False, True]
+    assert values[found].tolist() == [199.0, 0.0, 73.0, 73.0]
+    assert np.isnan(values[1])
+
+    # fractional or out-of-range queries must not be truncated onto an existing key
+    values, found = btree.find_many_arrays([5.5, 730, 730.0, 2 ** 70, 10.25])
+    assert found.tolist() == [False, True, True, False, False]
+    assert values[found].tolist() == [73.0, 73.0]
+    assert btree.find_many_arrays([])[1].tolist() == []
+
+    # the inherited BTree.find_many keeps its list contract
+    assert btree.find_many(queries, Prefetcher(2)) == [199.0, None, 0.0, 73.0, None, 73.0]
+
+
+def test_numeric_range_and_aggregates():
+    btree = make_series(3, 4)
+
+    chunks = list(btree.range(95, 305))
+    keys = np.concatenate([k for k, _ in chunks])
+    assert keys.tolist() == list(range(100, 301, 10))
+    # range results are views over the leaf buffers
+    assert all(not k.flags.owndata for k, _ in chunks)
+
+    assert btree.aggregate("count", 95, 305) == 21
+    assert btree.aggregate("sum", 95, 305) == sum(range(10, 31))
+    assert btree.aggregate("min", 95, 305) == 10.0
+    assert btree.aggregate("max") == 199.0
+    assert btree.aggregate("max", 5, 6) is None
+
+    with pytest.raises(ValueError):
+        btree.aggregate("median")
+
+
+def test_numeric_rejects_lossy_casts():
+    btree = NumericBTree(3, 3)
+    for key in [5.7, 2 ** 70, "abc"]:
+        with pytest.raises(ValueError):
+            btree.insert(key, 1.0)
+    for value in ["1.0", 2 ** 2000]:
+        with pytest.raises(ValueError):
+            btree.insert(5, value)
+    assert len(btree) == 0
+    assert btree.find(5) is None
+
+    btree.insert(5.0, 1)
+    btree.insert(6, float("nan"))
+    assert btree.find(5) == 1.0
+    assert np.isnan(btree.find(6))
+
+
+def test_numeric_float_dtypes_round():
+    btree = NumericBTree(3, 3, value_dtype="float32")
+    btree.insert(1, 0.1)
+    btree.insert(2, 2 ** 53 + 1)
+    assert btree.find(1) == pytest.approx(0.1)
+    assert btree.find(2) == float(2 ** 53)
+    with pytest.raises(ValueError):
+        btree.insert(3, 1e300)  # finite, but inf as float32
+    btree.insert(3, float("inf"))
+    assert btree.find(3) == float("inf")
+    assert len(btree) == 3
@@ -0,0 +1,71 @@
+from py_btrees.disk import DISK, Disk
+from py_btrees.prefetch import Prefetcher
+
+import pytest
+
+
+def test_read_many(make_tree):
+    btree = make_tree(3, 3, 20)
+    root = DISK.read(btree.root_addr)
+    nodes = DISK.read_many(root.children_addrs)
+    assert [node.my_addr for node in nodes] == root.children_addrs
+    with pytest.raises(ValueError):
+        DISK.read_many([len(DISK.memory)])
+
+
+@pytest.mark.parametrize("depth", [1, 4, 16])
+def test_prefetched_scan(depth, make_tree):
+    btree = make_tree(4, 3)
+    prefetcher = Prefetcher(depth)
+
+    assert list(btree.items(prefetcher=prefetcher)) == list(btree.items())
+    assert prefetcher.used > 0
+    assert prefetcher.issued == prefetcher.used + prefetcher.wasted
+    # every leaf of the scan was read ahead of time
+    assert prefetcher.used >= btree.stats().leaves
+
+    prefetcher = Prefetcher(depth)
+    assert [k for k, _ in btree.items(0, 20, prefetcher=prefetcher)] == list(range(20))
+    assert prefetcher.wasted <= depth * btree.stats().height
+
+
+def test_find_many(make_tree):
+    btree = make_tree(3, 2)
+    queries = [299, 5, 1000, 5, -1, 150]
+    prefetcher = Prefetcher(4)
+
+    assert btree.find_many(queries, prefetcher) == ["299", "5", None, "5", None, "150"]
+    assert prefetcher.misses == 0
+    assert prefetcher.wasted == 0
+    assert btree.find_many([]) == []
+
+
+def test_prefetcher_capacity(make_tree):
+    btree = make_tree(3, 3)
+    prefetcher = Prefetcher(depth=2, capacity=2)
+    root = DISK.read(btree.root_addr)
+    prefetcher.prefetch(root.children_addrs)
+    assert len(prefetcher.cache) == 2
+    assert prefetcher.wasted == len(root.children_addrs)
+
+    with pytest.raises(ValueError):
+        Prefetcher(0)
+
+
+@pytest.mark.parametrize("depth", [1, 4])
+def test_prefetched_scan_reads_each_node_once(make_tree, monkeypatch, depth):
+    btree = make_tree(4, 3, 300)
+    n_nodes = btree.stats().nodes
+
+    reads = []
+    original_read, original_read_many = Disk.read, Disk.read_many
+    monkeypatch.setattr(Disk, "read", lambda self, addr: reads.append(addr) or original_read(self, addr))
+    monkeypatch.setattr(Disk, "read_many", lambda self, addrs: reads.extend(addrs) or original_read_many(self, addrs))
+
+    prefetcher = Prefetcher(depth)
+    assert len(list(btree.items(prefetcher=prefetcher))) == 300
+
+    # no parent is read again on the way to the next leaf, and every read is counted
+    assert sorted(reads) == sorted(set(reads))
+    assert len(reads) == n_nodes == prefetcher.issued + prefetcher.misses
+    assert prefetcher.wasted == 0
@@ -0,0 +1,70 @@
+from py_btrees.disk import DISK, Disk
+from py_btrees.btree import BTree
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous bound on how much importing the package and graph.py may add to interpreter startup.
+# It only has to catch regressions such as a heavy optional dependency imported at module load.
+IMPORT_BUDGET_SECONDS = 0.5
+
+
+def run_python(code: str) -> float:
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "", result.stdout
+    return elapsed
+
+
+def test_imports_are_lazy():
+    run_python(
+        "import sys, py_btrees, graph\n"
+        "from py_btrees import BTree\n"
+        "t = BTree(3, 3); t.insert(1, '1'); list(graph.iterate(t))\n"
+        "heavy = {'numpy', 'graphviz'} & set(sys.modules)\n"
+        "if heavy: print(sorted(heavy))\n"
+    )
+
+
+def test_import_time():
+    baseline = min(run_python("pass") for _ in range(3))
+    with_package = min(run_python("import py_btrees.btree, graph") for _ in range(3))
+    assert with_package - baseline < IMPORT_BUDGET_SECONDS
+
+
+def test_open_reads_only_root(monkeypatch):
+    btree = BTree(3, 3)
+    for i in range(1000):
+        btree.insert(i, str(i))
+    height = btree.stats().height
+
+    reads = []
+    original_read = Disk.read
+    def counting_read(self, addr):
+        reads.append(addr)
+        return original_read(self, addr)
+    monkeypatch.setattr(Disk, "read", counting_read)
+
+    n_blocks = len(DISK.memory)
+    opened = BTree.open(btree.root_addr, 3, 3)
+    assert reads == [btree.root_addr]
+    assert len(DISK.memory) == n_blocks  # nothing allocated
+
+    assert opened.find(500) == "500"
+    assert len(reads) == 1 + height
+
+
+def test_open_rejects_non_root():
+    btree = BTree(3, 3)
+    for i in range(10):
+        btree.insert(i, str(i))
+    leaf = btree._find_node(0)
+    with pytest.raises(ValueError):
+        BTree.open(leaf.my_addr, 3, 3)